@@ -0,0 +1,82 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+def import_times(module):
+
+    '''Imports a module in a fresh interpreter with `-X importtime`.
+
+    :param module: The module to import, i.e. main
+    :return: {imported module name: cumulative import time in microseconds}
+    '''
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True)
+
+    times = {}
+
+    # Lines look like `import time:   self [us] | cumulative | imported package`
+    for line in result.stderr.splitlines():
+
+        if not line.startswith('import time:') or 'cumulative' in line:
+
+            continue
+
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def wall_time(code):
+
+    '''Returns the seconds a fresh interpreter takes to run `code` and exit.'''
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+    return time.perf_counter() - start
+
+
+def main():
+
+    '''Measures interpreter startup for the game's entry points.'''
+
+    parser = argparse.ArgumentParser(description='Measures startup time with -X importtime.')
+    parser.add_argument('modules', nargs='*', default=['main', 'server'],
+                        help='modules to import (default: main server)')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=5,
+                        help='slowest imports to list per module')
+    args = parser.parse_args()
+
+    baseline = statistics.median(wall_time('pass') for _ in range(args.runs))
+    print(f'Bare interpreter: {baseline * 1000:.1f} ms\n')
+
+    for module in args.modules:
+
+        runs = [import_times(module) for _ in range(args.runs)]
+        wall = statistics.median(wall_time(f'import {module}') for _ in range(args.runs))
+
+        # Median of each import's cumulative time across runs
+        medians = {name: statistics.median(times.get(name, 0) for times in runs)
+                   for name in runs[0]}
+
+        print(f'import {module}: {medians.get(module, 0) / 1000:.1f} ms imports, '
+              f'{wall * 1000:.1f} ms wall ({(wall - baseline) * 1000:+.1f} ms over bare)')
+
+        slowest = sorted((name for name in medians if name != module),
+                         key=medians.get, reverse=True)
+
+        for name in slowest[:args.top]:
+
+            print(f'    {medians[name] / 1000:8.1f} ms  {name}')
+
+        print()
+
+
+if __name__ == '__main__':
+
+    main()
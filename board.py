@@ -1,15 +1,21 @@
-import os
 import copy
 
+import evaluation
 from referee import Referee
+from renderer import Renderer
+
+# Board dimensions for each difficulty
+BOARD_SIZES = {'beginner': 6, 'novice': 8, 'experienced': 10}
 
 class Board:
 
-    def __init__(self, difficulty):
+    def __init__(self, difficulty, render=True, config=None):
 
         '''Class implements methods to generate and determine the next best possible move.
 
         :param difficulty: beginner/novice/experienced. Determines board size
+        :param render: Whether the scoreboard and board are drawn before each move
+        :param config: Search depth and evaluation weights, see `evaluation.load_config()`
         '''
 
         self.difficulty = difficulty
@@ -19,6 +25,11 @@ class Board:
         self.p2_stone = '○'
 
         self.ref = Referee()
+        self.renderer = Renderer() if render else None
+        self.config = config or evaluation.load_config()
+
+        # Set to a `profiling.MoveProfiler` to profile the AI's moves
+        self.profiler = None
 
 
     def generate_board(self):
@@ -30,22 +41,11 @@ class Board:
             - Experienced: 10x10
         '''
 
-        if self.difficulty == 'beginner':
-
-            board_size = 6
-
-        elif self.difficulty == 'novice':
-
-            board_size = 8
-
-        elif self.difficulty == 'experienced':
-
-            board_size = 10
-
-        else:
+        if self.difficulty not in BOARD_SIZES:
 
             exit('\n-- Invalid argument entered, see README file for instructions --\n')
 
+        board_size = BOARD_SIZES[self.difficulty]
         self.board = [['*' for j in range(board_size)] for i in range(board_size)]
 
         while not self.ref.completion_check(self.board):
@@ -57,31 +57,31 @@ class Board:
 
     def refresh_screen(self):
 
-        '''Clears the terminal window for nicer UI/UX.'''
+        '''Redraws the scoreboard and board in place for nicer UI/UX.'''
 
-        # For Windows
-        if os.name == 'nt':
+        if self.renderer is None:
 
-            _ = os.system('cls')
+            return
+
+        frame = self.ref.scoreboard().splitlines()
+        frame.extend(['', f'Move: {self.ref.move}', f'Last Placed: {self.ref.last_placed}', ''])
+        frame.extend(self.board_lines())
+
+        self.renderer.render(frame)
 
-        # For MacOS and Linux
-        else:
 
-            _ = os.system('clear')
+    def board_lines(self):
 
-        self.ref.print_scoreboard()
-        print(f'Move: {self.ref.move}')
-        print(f'Last Placed: {self.ref.last_placed}\n')
-        self.print_board()
+        '''Returns the current board state as one line per row.'''
+
+        return [' '.join(row) for row in self.board]
 
 
     def print_board(self):
 
         '''Prints the current board state.'''
 
-        for i in range(len(self.board)):
-
-            print(' '.join(self.board[i]))
+        print('\n'.join(self.board_lines()))
 
 
     def error_message(self):
@@ -96,6 +96,11 @@ class Board:
 [Press ENTER to continue]
 ''')
 
+        # The message may have scrolled the screen, so redraw it from scratch
+        if self.renderer is not None:
+
+            self.renderer.invalidate()
+
 
     def place_stone(self, x, y):
 
@@ -145,13 +150,29 @@ class Board:
         # If it is the AI's turn
         else:
 
-            last_x, last_y = self.ref.last_placed
-            value, x, y = self.minimax([self.board, (last_x, last_y)], 6,
-                                       float('-inf'), float('inf'), True)
+            if self.profiler is None:
+
+                x, y = self.ai_move()
+
+            else:
+
+                x, y = self.profiler.profile(self.ai_move)
 
             self.ref.valid_move(self.board, str(x), str(y))
 
-        x, y = int(x), int(y)
+        self.apply_move(int(x), int(y))
+
+
+    def apply_move(self, x, y):
+
+        '''Places the current player's stone, updates the scores and swaps turns.
+
+        The move is expected to already have been accepted by `Referee.valid_move()`.
+
+        :param x: The x-coordinate of the move
+        :param y: The y-coordinate of the move
+        '''
+
         self.place_stone(x, y)
 
         # Check for any change in scores after the last move, then swap
@@ -159,6 +180,25 @@ class Board:
         self.ref.player_swap()
 
 
+    def ai_move(self, depth=None):
+
+        '''Searches for the AI's (Player 2) next move from the current board state.
+
+        :param depth: How many moves minimax should look ahead, from the config if None
+        :return: (x_coord, y_coord) of the best move found
+        '''
+
+        if depth is None:
+
+            depth = self.config['depth']
+
+        last_x, last_y = self.ref.last_placed
+        value, x, y = self.minimax([self.board, (last_x, last_y)], depth,
+                                   float('-inf'), float('inf'), True)
+
+        return x, y
+
+
     def make_possible_moves(self, board, stone, coordinates):
 
         '''Uses coordinates passed in to generate possible board states.
@@ -293,14 +333,14 @@ class Board:
 
     def board_value(self, board):
 
-        '''Computes the value of the board state passed in.
+        '''Computes the value of the board state passed in, see `evaluation.evaluate()`.
 
         :param board: [board state, (last_x, last_y)]
         :return: A list in the form [value, x_coord, y_coord]
         '''
 
-        self.ref.assign_scores(board[0])
-        return self.ref.p2_score - self.ref.p1_score, board[1][0], board[1][1]
+        value = evaluation.evaluate(self.ref, board[0], board[1], self.config['weights'])
+        return value, board[1][0], board[1][1]
 
 
     def minimax(self, position, depth, alpha, beta, is_ai):
@@ -0,0 +1,204 @@
+import json
+import os
+
+from functools import lru_cache
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'evaluation.json')
+
+# Order of the values returned by `features()`
+FEATURES = ('score', 'open_threes', 'potential_fours', 'at_risk', 'freedom_parity')
+
+# Used when there is no config file: the score alone, as searched before the features
+DEFAULT_CONFIG = {'depth': 6, 'weights': {'score': 1.0}}
+
+P1_STONE = '●'
+P2_STONE = '○'
+
+def load_config(path=CONFIG_FILE):
+
+    '''Loads the search depth and feature weights used by the AI.
+
+    Each file is only read once per process, so every Board can call this cheaply.
+
+    :param path: The JSON config file, `evaluation.json` by default
+    :return: {'depth': int, 'weights': [weight of each feature in FEATURES]}
+    '''
+
+    depth, weights = read_config(path)
+
+    return {'depth': depth, 'weights': list(weights)}
+
+
+@lru_cache(maxsize=None)
+def read_config(path):
+
+    '''Reads a config file, falling back to DEFAULT_CONFIG if it doesn't exist.
+
+    :param path: The JSON config file
+    :return: (depth, tuple of the weight of each feature in FEATURES)
+    '''
+
+    config = DEFAULT_CONFIG
+
+    if os.path.exists(path):
+
+        try:
+
+            with open(path, encoding='utf-8') as f:
+
+                config = json.load(f)
+
+        except ValueError:
+
+            exit(f'\n-- {path} is not valid JSON, fix or delete it --\n')
+
+    weights = config.get('weights', {})
+
+    return config.get('depth', 6), tuple(weights.get(name, 0.0) for name in FEATURES)
+
+
+def save_config(config, path=CONFIG_FILE):
+
+    '''Writes a config in the form returned by `load_config()`.'''
+
+    with open(path, 'w', encoding='utf-8') as f:
+
+        json.dump({'depth': config['depth'],
+                   'weights': dict(zip(FEATURES, config['weights']))}, f, indent=4)
+        f.write('\n')
+
+    read_config.cache_clear()
+
+
+def count_threats(direction, stone):
+
+    '''Counts the threats one player has along a direction.
+
+    - Open threes: exactly three stones in a row, with room to grow into a four
+    - Potential fours: four cells holding three stones and a gap, that would score
+      a point if the gap was filled
+    - At risk: exactly four stones in a row, with room to grow into a five and lose
+      the point
+
+    :param direction: The direction to be checked, a list of cells
+    :param stone: The player's stone
+    :return: (open threes, potential fours, at risk)
+    '''
+
+    open_threes = 0
+    potential_fours = 0
+    at_risk = 0
+
+    length = len(direction)
+    i = 0
+
+    # Runs of the player's stones
+    while i < length:
+
+        if direction[i] != stone:
+
+            i += 1
+            continue
+
+        start = i
+
+        while i < length and direction[i] == stone:
+
+            i += 1
+
+        run = i - start
+        room = (start > 0 and direction[start-1] == '*') or \
+               (i < length and direction[i] == '*')
+
+        if run == 3 and room:
+
+            open_threes += 1
+
+        elif run == 4 and room:
+
+            at_risk += 1
+
+    # Windows of four cells, three stones and a gap, not touching more stones
+    for start in range(length - 3):
+
+        window = direction[start:start+4]
+
+        if window.count(stone) == 3 and window.count('*') == 1 and \
+           (start == 0 or direction[start-1] != stone) and \
+           (start + 4 == length or direction[start+4] != stone):
+
+            potential_fours += 1
+
+    return open_threes, potential_fours, at_risk
+
+
+def freedom_parity(board, last_placed):
+
+    '''Determines which player, if any, will have freedom on the next move.
+
+    A player has freedom when every space next to the last placed stone is taken. The
+    board has an even number of spaces and Player 1 moves first, so Player 1 is to
+    move whenever an even number of spaces is left.
+
+    :param board: The board state
+    :param last_placed: Coordinates of the last placed stone
+    :return: 1 if the AI (Player 2) has freedom, -1 if Player 1 does, 0 otherwise
+    '''
+
+    x, y = last_placed
+    size = len(board)
+
+    for i, j in ((x+1, y), (x-1, y), (x, y+1), (x, y-1)):
+
+        if 0 <= i < size and 0 <= j < size and board[i][j] == '*':
+
+            return 0
+
+    vacant_spaces = sum(row.count('*') for row in board)
+
+    if vacant_spaces == 0:
+
+        return 0
+
+    return -1 if vacant_spaces % 2 == 0 else 1
+
+
+def features(ref, board, last_placed):
+
+    '''Computes the features of a board state from the AI's (Player 2) point of view.
+
+    Every feature is Player 2's value minus Player 1's, in the order of FEATURES.
+
+    :param ref: The Referee used to score the board
+    :param board: The board state
+    :param last_placed: Coordinates of the last placed stone
+    :return: A list of feature values
+    '''
+
+    ref.assign_scores(board)
+
+    values = [ref.p2_score - ref.p1_score, 0, 0, 0, freedom_parity(board, last_placed)]
+
+    for direction in ref.directions(board):
+
+        for sign, stone in ((1, P2_STONE), (-1, P1_STONE)):
+
+            for k, count in enumerate(count_threats(direction, stone), 1):
+
+                values[k] += sign * count
+
+    return values
+
+
+def evaluate(ref, board, last_placed, weights):
+
+    '''Scores a board state from the AI's (Player 2) point of view.
+
+    :param ref: The Referee used to score the board
+    :param board: The board state
+    :param last_placed: Coordinates of the last placed stone
+    :param weights: The weight of each feature in FEATURES
+    :return: The weighted sum of the board's features
+    '''
+
+    return sum(w * v for w, v in zip(weights, features(ref, board, last_placed)))
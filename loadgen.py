@@ -0,0 +1,214 @@
+import argparse
+import asyncio
+import random
+import time
+
+from referee import Referee
+
+class GameClient:
+
+    def __init__(self, reader, writer):
+
+        '''Speaks the line protocol of `server.py` over an open connection.'''
+
+        self.reader = reader
+        self.writer = writer
+        self.latencies = []
+        self.busy = 0
+
+
+    async def request(self, line):
+
+        '''Sends a command and returns the words of the reply.
+
+        :param line: The command line, without the trailing newline
+        :return: The reply split into words, i.e. ['OK', '1', '6']
+        '''
+
+        start = time.monotonic()
+
+        self.writer.write(f'{line}\n'.encode())
+        await self.writer.drain()
+        reply = (await self.reader.readline()).decode().split()
+
+        self.latencies.append(time.monotonic() - start)
+
+        return reply
+
+
+    async def expect_ok(self, line):
+
+        '''Sends a command, raising RuntimeError with the reply unless it is `OK`.
+
+        :return: The words of the reply after `OK`
+        '''
+
+        reply = await self.request(line)
+
+        if not reply or reply[0] != 'OK':
+
+            raise RuntimeError(' '.join(reply) or 'connection closed')
+
+        return reply[1:]
+
+
+    async def pick_move(self, game_id):
+
+        '''Picks a random valid move for Player 1 from the server's board.'''
+
+        move, last_x, last_y, rows = await self.expect_ok(f'BOARD {game_id}')
+        board = [list(row) for row in rows.split('/')]
+
+        moves = []
+
+        for x in range(len(board)):
+
+            for y in range(len(board)):
+
+                # `Referee.valid_move()` updates `last_placed`, so check with a fresh one
+                ref = Referee()
+                ref.move = int(move)
+
+                if last_x != '-':
+
+                    ref.last_placed = (int(last_x), int(last_y))
+
+                if ref.valid_move(board, str(x), str(y)):
+
+                    moves.append((x, y))
+
+        return random.choice(moves)
+
+
+    async def play(self, difficulty, deadline_ms):
+
+        '''Plays one game with random moves against the server's AI.
+
+        :return: The game's final status, i.e. `p2`
+        '''
+
+        game_id, _ = await self.expect_ok(f'NEW {difficulty}')
+
+        try:
+
+            while True:
+
+                x, y = await self.pick_move(game_id)
+                reply = await self.request(f'MOVE {game_id} {x} {y} {deadline_ms}')
+
+                # Back off while the server's search pool is saturated
+                while reply == ['ERR', 'busy']:
+
+                    self.busy += 1
+                    await asyncio.sleep(0.05)
+                    reply = await self.request(f'MOVE {game_id} {x} {y} {deadline_ms}')
+
+                while reply == ['ERR', 'timeout']:
+
+                    reply = await self.request(f'WAIT {game_id} {deadline_ms}')
+
+                if not reply or reply[0] != 'OK':
+
+                    raise RuntimeError(' '.join(reply) or 'connection closed')
+
+                if reply[-1] != 'playing':
+
+                    return reply[-1]
+
+        finally:
+
+            # Also on errors, so failed games don't use up the server's game limit
+            await self.request(f'CLOSE {game_id}')
+
+
+async def connect(args):
+
+    '''Opens a connection to the server given on the command line.'''
+
+    if args.unix is not None:
+
+        return await asyncio.open_unix_connection(args.unix)
+
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def run(args):
+
+    '''Plays `args.games` games, `args.concurrency` at a time, and prints a summary.'''
+
+    queue = asyncio.Queue()
+
+    for _ in range(args.games):
+
+        queue.put_nowait(args.difficulty)
+
+    clients = []
+    results = []
+
+    async def worker():
+
+        reader, writer = await connect(args)
+        client = GameClient(reader, writer)
+        clients.append(client)
+
+        while not queue.empty():
+
+            difficulty = queue.get_nowait()
+
+            try:
+
+                results.append(await client.play(difficulty, args.deadline_ms))
+
+            except RuntimeError as exc:
+
+                results.append(f'error ({exc})')
+
+        writer.write(b'QUIT\n')
+        writer.close()
+
+    start = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.monotonic() - start
+
+    latencies = sorted(latency for client in clients for latency in client.latencies)
+
+    print(f'Games: {len(results)} in {elapsed:.2f}s ({len(results) / elapsed:.2f} games/s)')
+    print(f'Requests: {len(latencies)} ({len(latencies) / elapsed:.2f} requests/s)')
+
+    for percentile in (50, 95, 99):
+
+        index = min(len(latencies) - 1, len(latencies) * percentile // 100)
+        print(f'p{percentile} latency: {latencies[index] * 1000:.1f} ms')
+
+    print(f'Busy replies: {sum(client.busy for client in clients)}')
+
+    for result in sorted(set(results)):
+
+        print(f'{result}: {results.count(result)}')
+
+    reader, writer = await connect(args)
+    client = GameClient(reader, writer)
+    print('\nServer: ' + ' '.join((await client.request('STATS'))[1:]))
+    writer.close()
+
+
+def main():
+
+    '''Runs the load generator against a local `server.py`.'''
+
+    parser = argparse.ArgumentParser(description='Plays many games against server.py.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--unix', metavar='PATH', help='connect to a Unix socket instead of TCP')
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--difficulty', default='beginner')
+    parser.add_argument('--deadline-ms', type=int, default=10000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+
+    main()
@@ -1,4 +1,4 @@
-import sys
+import argparse
 
 from board import Board
 
@@ -6,10 +6,36 @@ def main():
 
     '''Main function for the Freedom AI program.'''
 
-    difficulty = sys.argv[1].lower()
-    board = Board(difficulty)
+    parser = argparse.ArgumentParser(description='Play Freedom against a minimax AI.')
+    parser.add_argument('difficulty', type=str.lower,
+                        help='beginner (6x6), novice (8x8) or experienced (10x10)')
+    parser.add_argument('--no-render', action='store_true',
+                        help="don't draw the board, i.e. for scripted runs")
+    parser.add_argument('--profile', metavar='DIR',
+                        help="write a cProfile/tracemalloc profile of each AI move to DIR")
+    args = parser.parse_args()
 
-    board.generate_board()
+    board = Board(args.difficulty, render=not args.no_render)
+
+    if args.profile is None:
+
+        board.generate_board()
+        return
+
+    # Only imported when profiling, to keep startup fast
+    import profiling
+
+    run = profiling.new_run(args.profile)
+    board.profiler = profiling.MoveProfiler(run)
+
+    # The game exits once it is over, the summary is written either way
+    try:
+
+        board.generate_board()
+
+    finally:
+
+        profiling.write_summary(run)
 
 
 if __name__ == '__main__':
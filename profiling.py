@@ -0,0 +1,217 @@
+import argparse
+import collections
+import cProfile
+import glob
+import io
+import itertools
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+# Numbers the profiled moves of this process, shared by every MoveProfiler
+MOVES = itertools.count(1)
+
+def new_run(directory):
+
+    '''Creates a fresh subdirectory for one run's profiles, so runs aren't mixed.
+
+    :param directory: The directory given to `--profile`
+    :return: The path of the run's directory, i.e. `profile/run-20261019-172029-4242`
+    '''
+
+    base = os.path.join(directory, f"run-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+    run = base
+
+    # Another run of this process may have started within the same second
+    for suffix in itertools.count(2):
+
+        if not os.path.exists(run):
+
+            break
+
+        run = f'{base}~{suffix}'
+
+    os.makedirs(run)
+
+    return run
+
+
+class MoveProfiler:
+
+    def __init__(self, directory, interval=0.01):
+
+        '''Class profiles AI moves with cProfile and tracemalloc.
+
+        Each move writes `move-<pid>-<n>.pstats` and `move-<pid>-<n>.snapshot` to the
+        directory, so moves profiled in several processes of one run can share it.
+
+        :param directory: Where the per-move files are written, see `new_run()`
+        :param interval: Seconds between checks of the memory traced during a move
+        '''
+
+        self.directory = directory
+        self.interval = interval
+
+        os.makedirs(directory, exist_ok=True)
+
+
+    def profile(self, func, *args, **kwargs):
+
+        '''Calls `func(*args, **kwargs)` as one profiled move.
+
+        The minimax search frees its board copies before it returns, so a snapshot
+        taken at the end would miss them. Instead, the traced memory is checked while
+        the move runs and a snapshot is only taken when it has grown by a tenth since
+        the last one. The last of those snapshots is kept.
+
+        :return: Whatever `func` returns
+        '''
+
+        name = os.path.join(self.directory, f'move-{os.getpid()}-{next(MOVES):04d}')
+
+        tracemalloc.start()
+        largest = [tracemalloc.get_traced_memory()[0], tracemalloc.take_snapshot()]
+        done = threading.Event()
+
+        def sample():
+
+            while not done.wait(self.interval):
+
+                self.keep_if_larger(largest)
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+
+        profiler = cProfile.Profile()
+
+        try:
+
+            result = profiler.runcall(func, *args, **kwargs)
+
+        finally:
+
+            done.set()
+            sampler.join()
+
+            self.keep_if_larger(largest)
+            tracemalloc.stop()
+
+            profiler.dump_stats(f'{name}.pstats')
+
+            # Leave out the profiler's own allocations
+            largest[1].filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, threading.__file__),
+                tracemalloc.Filter(False, __file__),
+            ]).dump(f'{name}.snapshot')
+
+        return result
+
+
+    def keep_if_larger(self, largest):
+
+        '''Takes a snapshot if the traced memory grew by a tenth since the last one.
+
+        :param largest: [traced bytes, snapshot] of the last snapshot kept
+        '''
+
+        current = tracemalloc.get_traced_memory()[0]
+
+        if current > largest[0] * 1.1:
+
+            largest[:] = [current, tracemalloc.take_snapshot()]
+
+
+def summarize(directory, top=15):
+
+    '''Summarizes every profiled move of one run.
+
+    :param directory: The run's directory, see `new_run()`
+    :param top: How many functions and lines to list
+    :return: The summary text, or None if no moves were profiled
+    '''
+
+    stats_files = sorted(glob.glob(os.path.join(directory, 'move-*.pstats')))
+    snapshot_files = sorted(glob.glob(os.path.join(directory, 'move-*.snapshot')))
+
+    if not stats_files:
+
+        return None
+
+    output = io.StringIO()
+    output.write(f'Profiled moves: {len(stats_files)}\n\n')
+    output.write(f'---- Top {top} functions by cumulative time ----\n')
+
+    stats = pstats.Stats(*stats_files, stream=output)
+    stats.dump_stats(os.path.join(directory, 'all.pstats'))
+
+    # Don't list every move's file above the table
+    stats.files = []
+    stats.sort_stats('cumulative').print_stats(top)
+
+    # Bytes held by each line at the peak of each move, summed over moves
+    sizes = collections.Counter()
+    counts = collections.Counter()
+
+    for path in snapshot_files:
+
+        snapshot = tracemalloc.Snapshot.load(path)
+
+        for stat in snapshot.statistics('lineno'):
+
+            sizes[str(stat.traceback)] += stat.size
+            counts[str(stat.traceback)] += stat.count
+
+    output.write(f'---- Top {top} lines by bytes allocated (at each move\'s peak) ----\n\n')
+
+    for line, size in sizes.most_common(top):
+
+        output.write(f'{size / 1024:10.1f} KiB {counts[line]:8} blocks  {line}\n')
+
+    return output.getvalue()
+
+
+def write_summary(directory, top=15):
+
+    '''Writes the summary to `summary.txt` in the directory and prints it.'''
+
+    summary = summarize(directory, top)
+
+    if summary is None:
+
+        return
+
+    with open(os.path.join(directory, 'summary.txt'), 'w', encoding='utf-8') as f:
+
+        f.write(summary)
+
+    print(summary)
+
+
+def latest_run(directory):
+
+    '''Returns the newest run in a `--profile` directory, or the directory itself.'''
+
+    runs = sorted(glob.glob(os.path.join(directory, 'run-*')))
+
+    return runs[-1] if runs else directory
+
+
+def main():
+
+    '''Prints the summary of one profiled run.'''
+
+    parser = argparse.ArgumentParser(description='Summarizes the moves written by --profile.')
+    parser.add_argument('directory',
+                        help='a run directory, or a --profile directory for its newest run')
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    write_summary(latest_run(args.directory), args.top)
+
+
+if __name__ == '__main__':
+
+    main()
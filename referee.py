@@ -1,5 +1,33 @@
-# Used to easily obtain diagonals
-import numpy as np
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def diagonal_indices(size):
+
+    '''Precomputes the coordinates of every diagonal of a square board.
+
+    Both directions are covered, anti-diagonals (bottom left to top right) first,
+    including the single-cell diagonals in the corners.
+
+    :param size: The board's width/height
+    :return: A tuple of diagonals, each a tuple of (x, y) coordinates
+    '''
+
+    diagonals = []
+
+    # Anti-diagonals, starting from the top left corner
+    for offset in range(-size + 1, size):
+
+        diagonals.append(tuple((size - 1 - i, i + offset) for i in range(size)
+                               if 0 <= i + offset < size))
+
+    # Diagonals, starting from the top right corner
+    for offset in range(size - 1, -size, -1):
+
+        diagonals.append(tuple((i, i + offset) for i in range(size)
+                               if 0 <= i + offset < size))
+
+    return tuple(diagonals)
+
 
 class Referee:
 
@@ -29,7 +57,7 @@ class Referee:
         :return: True/False, whether the move is valid or not
         '''
 
-        if not x.isdigit() or not y.isdigit():
+        if not x.isdecimal() or not y.isdecimal():
 
             return False
 
@@ -62,6 +90,9 @@ class Referee:
                 self.last_placed = (x, y)
                 return True
 
+            # Corners are not edges, don't fall through to the edge checks
+            return False
+
         # Top right corner, no need to check above or right
         if last_x == 0 and last_y == len(board) - 1:
 
@@ -76,6 +107,9 @@ class Referee:
                 self.last_placed = (x, y)
                 return True
 
+            # Corners are not edges, don't fall through to the edge checks
+            return False
+
         # Bottom left corner, no need to check below or left
         if last_x == len(board) - 1 and last_y == 0:
 
@@ -90,6 +124,9 @@ class Referee:
                 self.last_placed = (x, y)
                 return True
 
+            # Corners are not edges, don't fall through to the edge checks
+            return False
+
         # Bottom right corner, no need to check above or right
         if last_x == len(board) - 1 and last_y == len(board) - 1:
 
@@ -104,6 +141,9 @@ class Referee:
                 self.last_placed = (x, y)
                 return True
 
+            # Corners are not edges, don't fall through to the edge checks
+            return False
+
         # If we're in the first row, no need to check above
         if last_x == 0:
 
@@ -207,8 +247,8 @@ class Referee:
         '''Assigns scores to players by checking horizontal and diagonal directions.
 
         This function makes use of `Referee.get_scores()` in order to assign scores.
-        The board will be split up into directions that need to be checked. `numpy` is
-        used to easily obtain diagonals. The following is an example of how a board would
+        The board will be split up into directions that need to be checked by
+        `Referee.directions()`. The following is an example of how a board would
         look like when points need to be assigned:
 
         ```
@@ -234,10 +274,23 @@ class Referee:
         self.p1_score = 0
         self.p2_score = 0
 
+        for direction in self.directions(board):
+
+            self.get_scores(direction)
+
+
+    def directions(self, board):
+
+        '''Generates every direction of the board that is checked for points.
+
+        :param board: The board state to be split up
+        :return: A generator of directions, each a list of cells
+        '''
+
         # Horizontal check
         for horizontal in board:
 
-            self.get_scores(horizontal)
+            yield horizontal
 
         # Vertical check
         for i in range(len(board)):
@@ -246,24 +299,14 @@ class Referee:
 
             for j in range(len(board)):
 
-                vertical.append(board[i][j])
+                vertical.append(board[j][i])
 
-            self.get_scores(vertical)
+            yield vertical
 
         # Diagonal check
-        # Code retreived from first response - https://bit.ly/3ojEgi5
-        b_array = np.array(board)
-        diagonals = [b_array[::-1, :].diagonal(i) for i in range(-b_array.shape[0] + 1, \
-                                                                 b_array.shape[1])]
-        diagonals.extend(b_array.diagonal(i) for i in range(b_array.shape[1]-1, \
-                                                            -b_array.shape[0],-1))
-
-        diagonals = [n.tolist() for n in diagonals]
-        # End of retreived code
+        for diagonal in diagonal_indices(len(board)):
 
-        for diagonal in diagonals:
-
-            self.get_scores(diagonal)
+            yield [board[x][y] for x, y in diagonal]
 
 
     def get_scores(self, direction):
@@ -271,9 +314,8 @@ class Referee:
         '''Assigns / deducts points to players depending on the board's status.
 
         Players will receive a point if they have exactly four stones of their color in
-        either a horizontal or diagonal manner. If there are more than four stones of the
-        same color in a horizontal or diagonal manner, a point is deducted from the
-        player.
+        a horizontal, vertical or diagonal manner. If there are more than four stones of
+        the same color in such a manner, a point is deducted from the player.
 
         :param direction: The direction to be checked
         '''
@@ -322,15 +364,21 @@ class Referee:
                 black_count = 0
 
 
-    def print_scoreboard(self):
+    def scoreboard(self):
 
-        '''Prints the current score of each player.'''
+        '''Returns the current score of each player.'''
 
-        print(f'''------ Scoreboard ------
+        return f'''------ Scoreboard ------
 ● Player 1: {self.p1_score}
 ○ Player 2: {self.p2_score}
-------------------------
-''')
+------------------------'''
+
+
+    def print_scoreboard(self):
+
+        '''Prints the current score of each player.'''
+
+        print(f'{self.scoreboard()}\n')
 
 
     def completion_check(self, board):
@@ -360,18 +408,26 @@ class Referee:
         place their last stone on the board.
         '''
 
-        self.assign_scores(board)
+        print(f'\n{self.result(board)}\n')
+        exit()
 
-        if self.p1_score > self.p2_score:
 
-            print('\nPlayer 1 wins the game!\n')
+    def result(self, board):
 
-        elif self.p2_score > self.p1_score:
+        '''Scores a finished board and describes the outcome of the game.
 
-            print('\nPlayer 2 wins the game!\n')
+        :param board: The final board state
+        :return: The result message, i.e. 'Player 1 wins the game!'
+        '''
 
-        else:
+        self.assign_scores(board)
 
-            print("\nIt's a draw!\n")
+        if self.p1_score > self.p2_score:
 
-        exit()
+            return 'Player 1 wins the game!'
+
+        if self.p2_score > self.p1_score:
+
+            return 'Player 2 wins the game!'
+
+        return "It's a draw!"
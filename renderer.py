@@ -0,0 +1,103 @@
+import os
+import sys
+
+class Renderer:
+
+    def __init__(self, stream=sys.stdout):
+
+        '''Class redraws frames in place using ANSI cursor control.
+
+        Only the cells that changed since the last frame are rewritten, and each frame
+        is sent to the terminal with a single write.
+
+        :param stream: The stream the frames are written to
+        '''
+
+        self.stream = stream
+        self.frame = None
+
+        # Enables ANSI escape sequences in the Windows console
+        if os.name == 'nt':
+
+            os.system('')
+
+
+    def invalidate(self):
+
+        '''Forces the next frame to be redrawn in full, i.e. after the screen scrolled.'''
+
+        self.frame = None
+
+
+    def render(self, lines):
+
+        '''Draws a frame at the top of the screen.
+
+        Anything printed below the previous frame, such as prompts and the user's
+        input, is erased.
+
+        :param lines: The lines making up the frame
+        '''
+
+        output = []
+
+        if self.frame is None:
+
+            # Clear the screen and draw everything from the top left corner
+            output.append('\x1b[H\x1b[2J')
+            output.append('\n'.join(lines))
+
+        else:
+
+            for row, line in enumerate(lines, 1):
+
+                previous = self.frame[row-1] if row <= len(self.frame) else None
+
+                if line == previous:
+
+                    continue
+
+                if previous is None or len(line) != len(previous):
+
+                    output.append(f'\x1b[{row};1H{line}\x1b[K')
+                    continue
+
+                output.extend(self.changed_cells(row, previous, line))
+
+        # Leave the cursor below the frame and erase the rest of the screen, including
+        # lines left over from a longer previous frame
+        output.append(f'\x1b[{len(lines) + 1};1H\x1b[J')
+
+        self.stream.write(''.join(output))
+        self.stream.flush()
+
+        self.frame = list(lines)
+
+
+    def changed_cells(self, row, previous, line):
+
+        '''Generates the output that turns one line into another of the same length.
+
+        Each run of changed characters is written after a single cursor move.
+
+        :param row: The line's row on the screen, starting at 1
+        :param previous: The line currently on the screen
+        :param line: The line to be drawn
+        '''
+
+        column = 0
+
+        while column < len(line):
+
+            if line[column] == previous[column]:
+
+                column += 1
+                continue
+
+            start = column
+
+            while column < len(line) and line[column] != previous[column]:
+
+                column += 1
+
+            yield f'\x1b[{row};{start + 1}H{line[start:column]}'
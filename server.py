@@ -0,0 +1,655 @@
+import argparse
+import asyncio
+import collections
+import inspect
+import itertools
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+import evaluation
+from board import Board, BOARD_SIZES
+
+# Line protocol, one command per line, one reply line per command:
+#
+#   NEW <difficulty>                  -> OK <game_id> <board_size>
+#   MOVE <game_id> <x> <y> [ms]       -> OK <ai_x> <ai_y> <p1_score> <p2_score> <status>
+#   WAIT <game_id> [ms]               -> OK <ai_x> <ai_y> <p1_score> <p2_score> <status>
+#   BOARD <game_id>                   -> OK <move> <last_x> <last_y> <row/row/...>
+#   CLOSE <game_id>                   -> OK
+#   STATS                             -> OK key=value ...
+#   QUIT                              -> (connection closed)
+#
+# `status` is one of `playing`, `p1`, `p2` or `draw`, and `-` replaces the AI's
+# coordinates when the game ended before it had to move. Failures are reported as
+# `ERR <reason>`. After `ERR timeout` or `ERR search-failed`, `WAIT` collects (or
+# retries) the AI's move. Games are closed when the connection that started them
+# disconnects.
+
+class ServerError(Exception):
+
+    '''Raised by a command handler to reply with `ERR <reason>`.'''
+
+
+def search(board, last_placed, config, profile=None):
+
+    '''Runs the AI's minimax search inside a pool worker.
+
+    :param board: The board state, Player 2 to move
+    :param last_placed: Coordinates of the last placed stone
+    :param config: Search depth and evaluation weights, see `evaluation.load_config()`
+    :param profile: A directory to write the search's profile to, if any
+    :return: (x_coord, y_coord) of the best move found
+    '''
+
+    game = Board(None, render=False, config=config)
+    game.board = board
+    game.ref.last_placed = last_placed
+
+    if profile is None:
+
+        return game.ai_move()
+
+    import profiling
+
+    return profiling.MoveProfiler(profile).profile(game.ai_move)
+
+
+class GameSession:
+
+    def __init__(self, game_id, difficulty, config):
+
+        '''A single game between a remote Player 1 and the AI.
+
+        :param game_id: The id clients use to refer to the game
+        :param difficulty: beginner/novice/experienced. Determines board size
+        :param config: Search depth and evaluation weights, see `evaluation.load_config()`
+        '''
+
+        self.game_id = game_id
+        self.game = Board(difficulty, render=False, config=config)
+
+        board_size = BOARD_SIZES[difficulty]
+        self.game.board = [['*' for j in range(board_size)] for i in range(board_size)]
+
+        # The AI's search, kept across requests if a deadline expires. `search` is the
+        # pool's own future, which (unlike `pending`) is cancelled as soon as asked
+        self.pending = None
+        self.search = None
+        self.lock = asyncio.Lock()
+
+
+    def status(self):
+
+        '''Returns `playing` or, once the board is full, the winning side.'''
+
+        ref = self.game.ref
+
+        if not ref.completion_check(self.game.board):
+
+            return 'playing'
+
+        ref.assign_scores(self.game.board)
+
+        if ref.p1_score > ref.p2_score:
+
+            return 'p1'
+
+        if ref.p2_score > ref.p1_score:
+
+            return 'p2'
+
+        return 'draw'
+
+
+class Metrics:
+
+    def __init__(self, window=10000):
+
+        '''Request counters and latency samples reported by `STATS`.
+
+        :param window: How many of the most recent latencies are kept per command
+        '''
+
+        self.started = time.monotonic()
+        self.requests = collections.Counter()
+        self.errors = collections.Counter()
+        self.latencies = collections.defaultdict(lambda: collections.deque(maxlen=window))
+
+
+    def record(self, command, elapsed, error=None):
+
+        '''Records a handled request.
+
+        :param command: The command name, i.e. MOVE
+        :param elapsed: Seconds spent handling the request
+        :param error: The `ERR` reason, if the request failed
+        '''
+
+        self.requests[command] += 1
+        self.latencies[command].append(elapsed)
+
+        if error is not None:
+
+            self.errors[error] += 1
+
+
+    def summary(self):
+
+        '''Returns the metrics as a list of `key=value` strings.'''
+
+        uptime = time.monotonic() - self.started
+        total = sum(self.requests.values())
+
+        fields = [f'uptime={uptime:.1f}', f'requests={total}',
+                  f'throughput={total / uptime if uptime else 0:.2f}']
+
+        for command, samples in sorted(self.latencies.items()):
+
+            ordered = sorted(samples)
+
+            for percentile in (50, 95, 99):
+
+                index = min(len(ordered) - 1, len(ordered) * percentile // 100)
+                fields.append(f'{command.lower()}_p{percentile}_ms={ordered[index] * 1000:.1f}')
+
+        fields.extend(f'err_{reason}={count}' for reason, count in sorted(self.errors.items()))
+
+        return fields
+
+
+class GameServer:
+
+    def __init__(self, workers=None, depth=None, deadline=10.0, max_pending=None,
+                 max_games=1000, profile=None):
+
+        '''Hosts many concurrent games and runs the AI's searches in a process pool.
+
+        :param workers: Number of search processes (defaults to the CPU count)
+        :param depth: How many moves minimax should look ahead, from the config if None
+        :param deadline: Default seconds a request may wait for the AI's move
+        :param max_pending: Searches allowed in flight before replying `ERR busy`
+        :param max_games: Games allowed at once before replying `ERR too-many-games`
+        :param profile: A directory to write a profile of every AI move to, if any
+        '''
+
+        self.workers = workers or os.cpu_count() or 1
+        # Loaded once here and sent along with each search, rather than by each worker
+        self.config = evaluation.load_config()
+
+        if depth is not None:
+
+            self.config['depth'] = depth
+        self.deadline = deadline
+        self.max_pending = max_pending or self.workers * 4
+        self.max_games = max_games
+        self.profile = None
+
+        if profile is not None:
+
+            import profiling
+
+            # Every worker writes to the same run directory
+            self.profile = profiling.new_run(profile)
+
+        self.pool = None
+        self.sessions = {}
+        self.pending = 0
+        self.ids = itertools.count(1)
+        self.metrics = Metrics()
+
+        self.handlers = {
+            'NEW': self.new_game,
+            'MOVE': self.move,
+            'WAIT': self.wait,
+            'BOARD': self.board,
+            'CLOSE': self.close,
+            'STATS': self.stats,
+        }
+
+
+    async def serve(self, host='127.0.0.1', port=7777, path=None):
+
+        '''Starts the process pool and serves clients until cancelled.
+
+        :param host: The TCP host to bind to
+        :param port: The TCP port to bind to
+        :param path: A Unix socket path, used instead of `host` and `port`
+        '''
+
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        if path is not None:
+
+            server = await asyncio.start_unix_server(self.handle_client, path=path)
+
+        else:
+
+            server = await asyncio.start_server(self.handle_client, host, port)
+
+        try:
+
+            async with server:
+
+                await server.serve_forever()
+
+        finally:
+
+            self.shutdown()
+
+
+    def shutdown(self):
+
+        '''Stops the process pool, dropping the searches that haven't started yet.
+
+        With `--profile` it waits for the running searches, then writes the summary.
+        '''
+
+        # `cancel_futures` needs 3.9
+        for session in self.sessions.values():
+
+            if session.search is not None:
+
+                session.search.cancel()
+
+        self.pool.shutdown(wait=self.profile is not None)
+
+        if self.profile is not None:
+
+            import profiling
+
+            profiling.write_summary(self.profile)
+
+
+    async def handle_client(self, reader, writer):
+
+        '''Reads commands from a client and replies to each of them in order.'''
+
+        # Games started on this connection, closed once it disconnects
+        games = set()
+
+        try:
+
+            while True:
+
+                line = await reader.readline()
+
+                if not line:
+
+                    break
+
+                args = line.decode(errors='replace').split()
+
+                if not args:
+
+                    continue
+
+                command = args[0].upper()
+
+                if command == 'QUIT':
+
+                    break
+
+                reply = await self.dispatch(command, args[1:])
+
+                if command == 'NEW' and reply.startswith('OK '):
+
+                    games.add(reply.split()[1])
+
+                writer.write(f'{reply}\n'.encode())
+
+                # Stop reading from clients that do not read their replies
+                await writer.drain()
+
+        except ConnectionError:
+
+            pass
+
+        finally:
+
+            for game_id in games:
+
+                self.end_game(game_id)
+
+            writer.close()
+
+
+    async def dispatch(self, command, args):
+
+        '''Runs the handler for a command and records its latency.
+
+        :param command: The command name, i.e. MOVE
+        :param args: The remaining words of the command line
+        :return: The reply line
+        '''
+
+        start = time.monotonic()
+        error = None
+
+        try:
+
+            if command not in self.handlers:
+
+                raise ServerError('unknown-command')
+
+            handler = self.handlers[command]
+
+            try:
+
+                inspect.signature(handler).bind(*args)
+
+            except TypeError:
+
+                raise ServerError('bad-arguments') from None
+
+            reply = 'OK ' + await handler(*args)
+
+        except ServerError as exc:
+
+            error = str(exc)
+            reply = f'ERR {error}'
+
+        # Client text isn't used as a key, it would grow the metrics without bound
+        if command not in self.handlers:
+
+            command = 'UNKNOWN'
+
+        self.metrics.record(command, time.monotonic() - start, error)
+
+        return reply.rstrip()
+
+
+    def session(self, game_id):
+
+        '''Looks up a game by id, raising `ERR no-such-game` if there is none.'''
+
+        if game_id not in self.sessions:
+
+            raise ServerError('no-such-game')
+
+        return self.sessions[game_id]
+
+
+    def check_open(self, session):
+
+        '''Raises `ERR game-closed` if the game was closed while waiting for its lock.'''
+
+        if self.sessions.get(session.game_id) is not session:
+
+            raise ServerError('game-closed')
+
+
+    def deadline_for(self, ms):
+
+        '''Returns the deadline in seconds, from the request's milliseconds if given.'''
+
+        if ms is None:
+
+            return self.deadline
+
+        if not ms.isdecimal():
+
+            raise ServerError('bad-arguments')
+
+        return int(ms) / 1000
+
+
+    async def new_game(self, difficulty):
+
+        '''NEW: starts a game, Player 1 (the client) moves first.'''
+
+        difficulty = difficulty.lower()
+
+        if difficulty not in BOARD_SIZES:
+
+            raise ServerError('bad-difficulty')
+
+        if len(self.sessions) >= self.max_games:
+
+            raise ServerError('too-many-games')
+
+        game_id = str(next(self.ids))
+        self.sessions[game_id] = GameSession(game_id, difficulty, self.config)
+
+        return f'{game_id} {BOARD_SIZES[difficulty]}'
+
+
+    async def move(self, game_id, x, y, ms=None):
+
+        '''MOVE: plays Player 1's stone, then replies with the AI's move.'''
+
+        session = self.session(game_id)
+        deadline = self.deadline_for(ms)
+
+        if not x.isdecimal() or not y.isdecimal():
+
+            raise ServerError('bad-arguments')
+
+        async with session.lock:
+
+            self.check_open(session)
+            game = session.game
+
+            if session.status() != 'playing':
+
+                raise ServerError('game-over')
+
+            if game.ref.current != 'Player 1':
+
+                raise ServerError('not-your-turn')
+
+            # Refuse the move rather than queue a search we cannot start soon
+            if self.pending >= self.max_pending:
+
+                raise ServerError('busy')
+
+            if not game.ref.valid_move(game.board, x, y):
+
+                raise ServerError('invalid-move')
+
+            game.apply_move(int(x), int(y))
+
+            return await self.ai_turn(session, deadline)
+
+
+    async def wait(self, game_id, ms=None):
+
+        '''WAIT: collects the AI's move after a MOVE that replied `ERR timeout`.
+
+        After `ERR search-failed` the search is submitted again.
+        '''
+
+        session = self.session(game_id)
+        deadline = self.deadline_for(ms)
+
+        async with session.lock:
+
+            self.check_open(session)
+
+            if session.pending is None:
+
+                # Only a failed search leaves the AI to move without one
+                if session.status() != 'playing' or session.game.ref.current != 'Player 2':
+
+                    raise ServerError('nothing-pending')
+
+                if self.pending >= self.max_pending:
+
+                    raise ServerError('busy')
+
+            return await self.ai_turn(session, deadline)
+
+
+    async def ai_turn(self, session, deadline):
+
+        '''Plays the AI's reply to the last move, waiting at most `deadline` seconds.
+
+        A search whose deadline expires keeps running in the pool; its move is applied
+        by a later `WAIT` for the same game.
+        '''
+
+        game = session.game
+
+        if session.status() != 'playing':
+
+            return f'- - {game.ref.p1_score} {game.ref.p2_score} {session.status()}'
+
+        if session.pending is None:
+
+            board = [row[:] for row in game.board]
+            future = self.pool.submit(search, board, game.ref.last_placed, self.config,
+                                      self.profile)
+
+            # The pool's future is only done once a worker is free again (or the search
+            # was cancelled before it started), unlike the asyncio future wrapping it.
+            # Its callbacks run in the pool's thread, so the count is updated on the loop
+            loop = asyncio.get_running_loop()
+
+            def release(_):
+
+                try:
+
+                    loop.call_soon_threadsafe(self.search_done)
+
+                except RuntimeError:
+
+                    # The server has shut down and closed its loop
+                    pass
+
+            self.pending += 1
+            future.add_done_callback(release)
+
+            session.search = future
+            session.pending = asyncio.wrap_future(future)
+
+        try:
+
+            x, y = await asyncio.wait_for(asyncio.shield(session.pending), deadline)
+
+        except asyncio.TimeoutError:
+
+            # The search may finish right after this, its move is kept for WAIT
+            raise ServerError('timeout') from None
+
+        except asyncio.CancelledError:
+
+            # CLOSE cancelled the search, rather than this request being cancelled
+            if not session.pending.cancelled():
+
+                raise
+
+            raise ServerError('game-closed') from None
+
+        except Exception:
+
+            session.pending = session.search = None
+            raise ServerError('search-failed') from None
+
+        session.pending = session.search = None
+        game.ref.valid_move(game.board, str(x), str(y))
+        game.apply_move(x, y)
+
+        return f'{x} {y} {game.ref.p1_score} {game.ref.p2_score} {session.status()}'
+
+
+    def search_done(self):
+
+        '''Frees a pending search slot once the pool finishes (or drops) a search.'''
+
+        self.pending -= 1
+
+
+    async def board(self, game_id):
+
+        '''BOARD: replies with the move count, last placed stone and the board rows.'''
+
+        game = self.session(game_id).game
+        last_x, last_y = game.ref.last_placed or ('-', '-')
+        rows = '/'.join(''.join(row) for row in game.board)
+
+        return f'{game.ref.move} {last_x} {last_y} {rows}'
+
+
+    async def close(self, game_id):
+
+        '''CLOSE: ends a game, dropping its search if one is still queued.
+
+        A MOVE or WAIT still waiting for the search replies `ERR game-closed`.
+        '''
+
+        if not self.end_game(game_id):
+
+            raise ServerError('no-such-game')
+
+        return ''
+
+
+    def end_game(self, game_id):
+
+        '''Removes a game, dropping its search if one is still queued.
+
+        :param game_id: The id of the game
+        :return: False if there was no such game
+        '''
+
+        session = self.sessions.pop(game_id, None)
+
+        if session is None:
+
+            return False
+
+        if session.pending is not None:
+
+            session.search.cancel()
+            session.pending.cancel()
+
+        return True
+
+
+    async def stats(self):
+
+        '''STATS: replies with request counts, latency percentiles and pool usage.'''
+
+        fields = self.metrics.summary()
+        fields.extend([f'games={len(self.sessions)}', f'pending={self.pending}',
+                       f'workers={self.workers}'])
+
+        return ' '.join(fields)
+
+
+def main():
+
+    '''Runs the multi-game server.'''
+
+    parser = argparse.ArgumentParser(description='Hosts many Freedom games over a line protocol.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--unix', metavar='PATH', help='serve on a Unix socket instead of TCP')
+    parser.add_argument('--workers', type=int, help='search processes (default: CPU count)')
+    parser.add_argument('--depth', type=int,
+                        help='minimax search depth (default: from evaluation.json)')
+    parser.add_argument('--deadline', type=float, default=10.0,
+                        help='default seconds a request waits for the AI')
+    parser.add_argument('--max-pending', type=int,
+                        help='searches in flight before replying busy (default: 4 per worker)')
+    parser.add_argument('--max-games', type=int, default=1000)
+    parser.add_argument('--profile', metavar='DIR',
+                        help='write a cProfile/tracemalloc profile of each AI move to DIR')
+    args = parser.parse_args()
+
+    server = GameServer(args.workers, args.depth, args.deadline, args.max_pending,
+                        args.max_games, args.profile)
+
+    try:
+
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+
+    except KeyboardInterrupt:
+
+        pass
+
+
+if __name__ == '__main__':
+
+    main()
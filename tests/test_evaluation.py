@@ -0,0 +1,70 @@
+import pytest
+
+import evaluation
+from referee import Referee
+
+@pytest.mark.parametrize('direction, threats', [
+    # Open three, and a potential four with the gap on either side
+    ('*●●●*', (1, 2, 0)),
+    # A three with no room to grow is neither
+    ('○●●●○', (0, 0, 0)),
+    # Three stones and a gap
+    ('●*●●○', (0, 1, 0)),
+    # Filling the gap would make a five, not a four
+    ('●●*●●', (0, 0, 0)),
+    # A four with room to become a five
+    ('●●●●*', (0, 0, 1)),
+    ('○●●●●○', (0, 0, 0)),
+    ('●●○●', (0, 0, 0)),
+])
+def test_count_threats(direction, threats):
+
+    assert evaluation.count_threats(list(direction), '●') == threats
+
+
+def empty_board(size=6):
+
+    return [['*'] * size for i in range(size)]
+
+
+def test_freedom_parity():
+
+    board = empty_board()
+
+    assert evaluation.freedom_parity(board, (0, 0)) == 0
+
+    # Every space next to the corner is taken, with 33 spaces left Player 2 moves
+    board[0][0] = board[0][1] = board[1][0] = '●'
+
+    assert evaluation.freedom_parity(board, (0, 0)) == 1
+
+    board[5][5] = '○'
+
+    assert evaluation.freedom_parity(board, (0, 0)) == -1
+
+
+def test_features_see_columns():
+
+    board = empty_board()
+
+    for i in range(3):
+
+        board[i+1][2] = '○'
+
+    assert evaluation.features(Referee(), board, (3, 2)) == [0, 1, 2, 0, 0]
+
+
+def test_missing_config_falls_back_to_score_only(tmp_path):
+
+    config = evaluation.load_config(str(tmp_path / 'missing.json'))
+
+    assert config == {'depth': 6, 'weights': [1.0, 0.0, 0.0, 0.0, 0.0]}
+
+
+def test_saved_config_is_reloaded(tmp_path):
+
+    path = str(tmp_path / 'evaluation.json')
+    evaluation.load_config(path)
+    evaluation.save_config({'depth': 3, 'weights': [1.0, 0.5, 0.0, 0.0, 0.0]}, path)
+
+    assert evaluation.load_config(path) == {'depth': 3, 'weights': [1.0, 0.5, 0.0, 0.0, 0.0]}
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+import profiling
+
+def allocate(size):
+
+    blocks = [bytearray(1024) for i in range(size)]
+
+    return len(blocks)
+
+
+def test_profile_writes_one_pair_of_files_per_move(tmp_path):
+
+    run = profiling.new_run(str(tmp_path))
+    profiler = profiling.MoveProfiler(run)
+
+    assert profiler.profile(allocate, 100) == 100
+    assert profiler.profile(allocate, 200) == 200
+
+    names = sorted(os.listdir(run))
+
+    assert len(names) == 4
+    assert all(name.startswith(f'move-{os.getpid()}-') for name in names)
+
+
+def test_summary_lists_functions_and_allocations(tmp_path):
+
+    run = profiling.new_run(str(tmp_path))
+    profiling.MoveProfiler(run).profile(allocate, 2000)
+
+    summary = profiling.summarize(run)
+
+    assert 'Profiled moves: 1' in summary
+    assert 'test_profiling.py' in summary.split('by bytes allocated')[1]
+
+
+def test_runs_are_summarized_separately(tmp_path):
+
+    first = profiling.new_run(str(tmp_path / 'first'))
+    second = profiling.new_run(str(tmp_path / 'second'))
+
+    profiling.MoveProfiler(first).profile(allocate, 10)
+    profiling.MoveProfiler(second).profile(allocate, 10)
+    profiling.MoveProfiler(second).profile(allocate, 10)
+
+    assert 'Profiled moves: 1' in profiling.summarize(first)
+    assert 'Profiled moves: 2' in profiling.summarize(second)
+    assert profiling.latest_run(str(tmp_path / 'second')) == second
+    assert profiling.summarize(str(tmp_path)) is None
+
+
+@pytest.mark.parametrize('parent', ['profile', 'a~b'])
+def test_new_run_never_reuses_a_directory(tmp_path, parent):
+
+    directory = str(tmp_path / parent)
+    runs = {profiling.new_run(directory) for i in range(3)}
+
+    assert len(runs) == 3
+    assert all(os.path.dirname(run) == directory for run in runs)
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from referee import Referee, diagonal_indices
+
+def test_diagonal_indices_3x3():
+
+    assert diagonal_indices(3) == (
+        ((0, 0),),
+        ((1, 0), (0, 1)),
+        ((2, 0), (1, 1), (0, 2)),
+        ((2, 1), (1, 2)),
+        ((2, 2),),
+        ((0, 2),),
+        ((0, 1), (1, 2)),
+        ((0, 0), (1, 1), (2, 2)),
+        ((1, 0), (2, 1)),
+        ((2, 0),),
+    )
+
+
+@pytest.mark.parametrize('size', [6, 8, 10])
+def test_diagonal_indices_match_numpy(size):
+
+    np = pytest.importorskip('numpy')
+    rng = random.Random(size)
+
+    for _ in range(20):
+
+        board = [[rng.choice('*●○') for j in range(size)] for i in range(size)]
+
+        # The slices `Referee.assign_scores()` used before the indices were precomputed
+        b_array = np.array(board)
+        diagonals = [b_array[::-1, :].diagonal(i) for i in range(-size + 1, size)]
+        diagonals.extend(b_array.diagonal(i) for i in range(size - 1, -size, -1))
+
+        assert [d.tolist() for d in diagonals] == \
+               [[board[x][y] for x, y in diagonal] for diagonal in diagonal_indices(size)]
+
+
+def test_assign_scores_counts_diagonal_fours():
+
+    board = [['*'] * 6 for i in range(6)]
+
+    for i in range(4):
+
+        board[i][i+2] = '●'
+        board[5-i][i] = '○'
+
+    ref = Referee()
+    ref.assign_scores(board)
+
+    assert (ref.p1_score, ref.p2_score) == (1, 1)
+
+
+def test_assign_scores_counts_vertical_fours():
+
+    board = [['*'] * 6 for i in range(6)]
+
+    for i in range(4):
+
+        board[i][0] = '●'
+
+    for i in range(5):
+
+        board[i][5] = '○'
+
+    ref = Referee()
+    ref.assign_scores(board)
+
+    # A five scores its four and then loses the point again
+    assert (ref.p1_score, ref.p2_score) == (1, 0)
@@ -0,0 +1,48 @@
+import io
+
+from renderer import Renderer
+
+def test_changed_cells_groups_runs():
+
+    renderer = Renderer(io.StringIO())
+
+    assert list(renderer.changed_cells(3, '* * * *', '● * ○ ○')) == [
+        '\x1b[3;1H●',
+        '\x1b[3;5H○',
+        '\x1b[3;7H○',
+    ]
+    assert list(renderer.changed_cells(2, 'abcdef', 'aXYdeZ')) == [
+        '\x1b[2;2HXY',
+        '\x1b[2;6HZ',
+    ]
+    assert list(renderer.changed_cells(1, 'abc', 'abc')) == []
+
+
+def test_render_redraws_only_changes_in_one_write():
+
+    stream = io.StringIO()
+    renderer = Renderer(stream)
+
+    renderer.render(['Move: 0', '* *'])
+    assert stream.getvalue() == '\x1b[H\x1b[2JMove: 0\n* *\x1b[3;1H\x1b[J'
+
+    stream.seek(0)
+    stream.truncate()
+
+    renderer.render(['Move: 1', '● *', 'Last Placed: (0, 0)'])
+    assert stream.getvalue() == ('\x1b[1;7H1'
+                                 '\x1b[2;1H●'
+                                 '\x1b[3;1HLast Placed: (0, 0)\x1b[K'
+                                 '\x1b[4;1H\x1b[J')
+
+
+def test_invalidate_forces_a_full_redraw():
+
+    stream = io.StringIO()
+    renderer = Renderer(stream)
+
+    renderer.render(['* *'])
+    renderer.invalidate()
+    renderer.render(['* *'])
+
+    assert stream.getvalue().count('\x1b[H\x1b[2J') == 2
@@ -0,0 +1,226 @@
+import asyncio
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import server
+
+@pytest.fixture
+def blocked_search(monkeypatch):
+
+    '''Replaces the AI's search with one that waits until the returned event is set.'''
+
+    release = threading.Event()
+
+    def search(board, last_placed, config, profile=None):
+
+        release.wait(5)
+        return 0, 1
+
+    monkeypatch.setattr(server, 'search', search)
+    yield release
+    release.set()
+
+
+def play(coroutine_function, **options):
+
+    '''Runs `coroutine_function(game_server)` against a server using a thread pool.'''
+
+    async def run():
+
+        game_server = server.GameServer(workers=1, depth=1, **options)
+        game_server.pool = ThreadPoolExecutor(max_workers=1)
+
+        try:
+
+            return await coroutine_function(game_server)
+
+        finally:
+
+            game_server.pool.shutdown(wait=False)
+
+    return asyncio.run(run())
+
+
+def test_move_replies_with_the_ai_move():
+
+    async def run(game_server):
+
+        assert await game_server.dispatch('NEW', ['beginner']) == 'OK 1 6'
+
+        reply = (await game_server.dispatch('MOVE', ['1', '0', '0'])).split()
+        assert reply[0] == 'OK' and reply[-1] == 'playing'
+        assert (int(reply[1]), int(reply[2])) in ((0, 1), (1, 0))
+
+        board = (await game_server.dispatch('BOARD', ['1'])).split()
+        assert board[:4] == ['OK', '2', reply[1], reply[2]]
+
+    play(run)
+
+
+@pytest.mark.parametrize('args, error', [
+    (['1', '²', '1'], 'bad-arguments'),
+    (['1', '0', '0', '²'], 'bad-arguments'),
+    (['1', '0'], 'bad-arguments'),
+    (['1', '9', '9'], 'invalid-move'),
+    (['2', '0', '0'], 'no-such-game'),
+])
+def test_move_errors(args, error):
+
+    async def run(game_server):
+
+        await game_server.dispatch('NEW', ['beginner'])
+
+        assert await game_server.dispatch('MOVE', args) == f'ERR {error}'
+
+    play(run)
+
+
+def test_timed_out_search_is_collected_by_wait(blocked_search):
+
+    async def run(game_server):
+
+        await game_server.dispatch('NEW', ['beginner'])
+
+        assert await game_server.dispatch('MOVE', ['1', '0', '0', '10']) == 'ERR timeout'
+        assert await game_server.dispatch('MOVE', ['1', '1', '0']) == 'ERR not-your-turn'
+
+        blocked_search.set()
+
+        assert await game_server.dispatch('WAIT', ['1']) == 'OK 0 1 0 0 playing'
+        assert await game_server.dispatch('WAIT', ['1']) == 'ERR nothing-pending'
+
+    play(run)
+
+
+def test_close_while_waiting_replies_game_closed(blocked_search):
+
+    async def run(game_server):
+
+        await game_server.dispatch('NEW', ['beginner'])
+        await game_server.dispatch('MOVE', ['1', '0', '0', '10'])
+
+        waiting = asyncio.create_task(game_server.dispatch('WAIT', ['1']))
+        await asyncio.sleep(0.05)
+
+        assert await game_server.dispatch('CLOSE', ['1']) == 'OK'
+        assert await waiting == 'ERR game-closed'
+
+        # The worker is still busy with the cancelled search
+        assert game_server.pending == 1
+
+        blocked_search.set()
+        await asyncio.sleep(0.05)
+
+        assert game_server.pending == 0
+
+    play(run)
+
+
+def test_move_is_refused_while_the_pool_is_saturated(blocked_search):
+
+    async def run(game_server):
+
+        await game_server.dispatch('NEW', ['beginner'])
+        await game_server.dispatch('NEW', ['beginner'])
+
+        assert await game_server.dispatch('MOVE', ['1', '0', '0', '10']) == 'ERR timeout'
+        assert await game_server.dispatch('MOVE', ['2', '0', '0', '10']) == 'ERR busy'
+
+    play(run, max_pending=1)
+
+
+def test_shutdown_drops_the_queued_searches(blocked_search):
+
+    async def run(game_server):
+
+        await game_server.dispatch('NEW', ['beginner'])
+        await game_server.dispatch('NEW', ['beginner'])
+        await game_server.dispatch('MOVE', ['1', '0', '0', '10'])
+        await game_server.dispatch('MOVE', ['2', '0', '0', '10'])
+
+        running = game_server.sessions['1'].search
+        queued = game_server.sessions['2'].search
+
+        game_server.shutdown()
+
+        assert queued.cancelled()
+        assert not running.cancelled()
+
+    play(run, max_pending=2)
+
+
+def test_unknown_commands_share_one_metrics_key():
+
+    async def run(game_server):
+
+        assert await game_server.dispatch('X0=1', []) == 'ERR unknown-command'
+        assert await game_server.dispatch('FOO', []) == 'ERR unknown-command'
+
+        stats = (await game_server.dispatch('STATS', [])).split()
+
+        assert 'unknown_p50_ms' in ' '.join(stats)
+        assert 'x0=1' not in ' '.join(stats).lower()
+        assert set(game_server.metrics.requests) == {'UNKNOWN', 'STATS'}
+
+    play(run)
+
+
+def test_wait_retries_a_failed_search(monkeypatch):
+
+    attempts = []
+
+    def search(board, last_placed, config, profile=None):
+
+        attempts.append(board)
+
+        if len(attempts) == 1:
+
+            raise MemoryError
+
+        return 0, 1
+
+    monkeypatch.setattr(server, 'search', search)
+
+    async def run(game_server):
+
+        await game_server.dispatch('NEW', ['beginner'])
+
+        assert await game_server.dispatch('MOVE', ['1', '0', '0']) == 'ERR search-failed'
+        assert await game_server.dispatch('MOVE', ['1', '1', '0']) == 'ERR not-your-turn'
+        assert await game_server.dispatch('WAIT', ['1']) == 'OK 0 1 0 0 playing'
+        assert await game_server.dispatch('WAIT', ['1']) == 'ERR nothing-pending'
+        assert len(attempts) == 2 and game_server.pending == 0
+
+    play(run)
+
+
+def test_disconnect_closes_the_connection_games():
+
+    async def run(game_server):
+
+        listener = await asyncio.start_server(game_server.handle_client, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+
+        async with listener:
+
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+            for _ in range(2):
+
+                writer.write(b'NEW beginner\n')
+                await reader.readline()
+
+            writer.write(b'CLOSE 1\n')
+            assert await reader.readline() == b'OK\n'
+            assert list(game_server.sessions) == ['2']
+
+            writer.close()
+            await reader.read()
+            await asyncio.sleep(0.05)
+
+            assert game_server.sessions == {}
+
+    play(run)
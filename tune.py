@@ -0,0 +1,252 @@
+import argparse
+import json
+import random
+
+import evaluation
+from board import Board, BOARD_SIZES
+
+def legal_moves(game):
+
+    '''Lists the coordinates the current player may place a stone on.'''
+
+    if game.ref.move == 0:
+
+        return [(x, y) for x in range(len(game.board)) for y in range(len(game.board))]
+
+    stone = game.p1_stone if game.ref.current == 'Player 1' else game.p2_stone
+
+    return [child[1] for child in game.generate_moves([game.board, game.ref.last_placed],
+                                                      stone)]
+
+
+def search(searcher, game, depth):
+
+    '''Finds the current player's best move with another Board's config.
+
+    :param searcher: The Board whose evaluation weights are used
+    :param game: The Board holding the game being played
+    :param depth: How many moves minimax should look ahead
+    :return: (x_coord, y_coord) of the best move found
+    '''
+
+    value, x, y = searcher.minimax([game.board, game.ref.last_placed], depth,
+                                   float('-inf'), float('inf'),
+                                   game.ref.current == 'Player 2')
+
+    return x, y
+
+
+def play(difficulty, players, epsilon=0.0, on_move=None, profiler=None):
+
+    '''Plays one game between two configs without any rendering.
+
+    The first stone is placed randomly so that games differ from each other.
+
+    :param difficulty: beginner/novice/experienced. Determines board size
+    :param players: {'Player 1': config, 'Player 2': config}
+    :param epsilon: The chance of a random move instead of a searched one
+    :param on_move: Called with the game after every move
+    :param profiler: A `profiling.MoveProfiler` to profile the searched moves with
+    :return: 1 if Player 2 wins, -1 if Player 1 wins, 0 for a draw
+    '''
+
+    board_size = BOARD_SIZES[difficulty]
+
+    game = Board(difficulty, render=False)
+    game.board = [['*' for j in range(board_size)] for i in range(board_size)]
+
+    searchers = {player: Board(difficulty, render=False, config=config)
+                 for player, config in players.items()}
+
+    while not game.ref.completion_check(game.board):
+
+        searcher = searchers[game.ref.current]
+
+        if game.ref.move == 0 or random.random() < epsilon:
+
+            x, y = random.choice(legal_moves(game))
+
+        elif profiler is None:
+
+            x, y = search(searcher, game, searcher.config['depth'])
+
+        else:
+
+            x, y = profiler.profile(search, searcher, game, searcher.config['depth'])
+
+        game.ref.valid_move(game.board, str(x), str(y))
+        game.apply_move(x, y)
+
+        if on_move is not None:
+
+            on_move(game)
+
+    game.ref.assign_scores(game.board)
+
+    return (game.ref.p2_score > game.ref.p1_score) - (game.ref.p1_score > game.ref.p2_score)
+
+
+def record(args):
+
+    '''Plays self-play games and appends every position's features and outcome.'''
+
+    config = evaluation.load_config(args.config)
+
+    if args.depth is not None:
+
+        config['depth'] = args.depth
+
+    with open(args.data, 'a', encoding='utf-8') as f:
+
+        for game_number in range(args.games):
+
+            positions = []
+
+            def on_move(game):
+
+                positions.append(evaluation.features(game.ref, game.board,
+                                                     game.ref.last_placed))
+
+            outcome = play(args.difficulty, {'Player 1': config, 'Player 2': config},
+                           args.epsilon, on_move, args.profiler)
+
+            for values in positions:
+
+                f.write(json.dumps({'features': values, 'outcome': outcome}) + '\n')
+
+            print(f'Game {game_number + 1}: {len(positions)} positions, outcome {outcome}')
+
+
+def fit(args):
+
+    '''Fits the feature weights to the recorded outcomes with least squares.
+
+    The weights are scaled so that `score` keeps a weight of 1, only their ratios
+    matter to minimax.
+    '''
+
+    # Only the batch tuner needs NumPy, so it isn't imported by the game itself
+    import numpy as np
+
+    features = []
+    outcomes = []
+
+    with open(args.data, encoding='utf-8') as f:
+
+        for line in f:
+
+            position = json.loads(line)
+            features.append(position['features'])
+            outcomes.append(position['outcome'])
+
+    weights, *_ = np.linalg.lstsq(np.array(features, dtype=float),
+                                  np.array(outcomes, dtype=float), rcond=None)
+
+    score_weight = weights[evaluation.FEATURES.index('score')]
+
+    if score_weight <= 0:
+
+        exit('\n-- Fitted score weight is not positive, record more games --\n')
+
+    config = evaluation.load_config(args.config)
+    config['weights'] = [round(float(w / score_weight), 4) for w in weights]
+    evaluation.save_config(config, args.config)
+
+    print(f'Fitted {len(outcomes)} positions:')
+
+    for name, weight in zip(evaluation.FEATURES, config['weights']):
+
+        print(f'    {name}: {weight}')
+
+
+def match(args):
+
+    '''Plays two configs against each other, alternating who moves first.'''
+
+    configs = {'a': evaluation.load_config(args.a), 'b': evaluation.load_config(args.b)}
+
+    for name in configs:
+
+        depth = getattr(args, f'depth_{name}')
+
+        if depth is not None:
+
+            configs[name]['depth'] = depth
+
+    wins = {'a': 0, 'b': 0, 'draw': 0}
+
+    for game_number in range(args.games):
+
+        first, second = ('a', 'b') if game_number % 2 == 0 else ('b', 'a')
+        outcome = play(args.difficulty, {'Player 1': configs[first],
+                                         'Player 2': configs[second]},
+                       profiler=args.profiler)
+
+        wins[{1: second, -1: first, 0: 'draw'}[outcome]] += 1
+
+    print(f"A ({args.a}, depth {configs['a']['depth']}): {wins['a']} wins")
+    print(f"B ({args.b}, depth {configs['b']['depth']}): {wins['b']} wins")
+    print(f"Draws: {wins['draw']}")
+
+
+def main():
+
+    '''Records self-play games, fits the evaluation weights and compares configs.'''
+
+    parser = argparse.ArgumentParser(description='Tunes the evaluation weights from self-play.')
+    parser.add_argument('--seed', type=int, help='seed for the random moves')
+    parser.add_argument('--profile', metavar='DIR',
+                        help='write a cProfile/tracemalloc profile of each searched move to DIR')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_record = commands.add_parser('record', help='record self-play games')
+    parser_record.add_argument('--games', type=int, default=20)
+    parser_record.add_argument('--difficulty', default='beginner', choices=BOARD_SIZES)
+    parser_record.add_argument('--depth', type=int, help='search depth (default: from config)')
+    parser_record.add_argument('--epsilon', type=float, default=0.1,
+                               help='chance of a random move, for varied games')
+    parser_record.add_argument('--config', default=evaluation.CONFIG_FILE)
+    parser_record.add_argument('--data', default='selfplay.jsonl')
+    parser_record.set_defaults(run=record)
+
+    parser_fit = commands.add_parser('fit', help='fit the weights to recorded games')
+    parser_fit.add_argument('--config', default=evaluation.CONFIG_FILE)
+    parser_fit.add_argument('--data', default='selfplay.jsonl')
+    parser_fit.set_defaults(run=fit)
+
+    parser_match = commands.add_parser('match', help='play two configs against each other')
+    parser_match.add_argument('a', help='config file of player A')
+    parser_match.add_argument('b', help='config file of player B')
+    parser_match.add_argument('--depth-a', type=int)
+    parser_match.add_argument('--depth-b', type=int)
+    parser_match.add_argument('--games', type=int, default=10)
+    parser_match.add_argument('--difficulty', default='beginner', choices=BOARD_SIZES)
+    parser_match.set_defaults(run=match)
+
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+
+    if args.profile is None:
+
+        args.profiler = None
+        args.run(args)
+        return
+
+    import profiling
+
+    run = profiling.new_run(args.profile)
+    args.profiler = profiling.MoveProfiler(run)
+
+    try:
+
+        args.run(args)
+
+    finally:
+
+        profiling.write_summary(run)
+
+
+if __name__ == '__main__':
+
+    main()